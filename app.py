@@ -1,8 +1,11 @@
 import logging
 from logging.handlers import TimedRotatingFileHandler
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 import os
 import json
+import orjson
 import requests
 from requests.exceptions import HTTPError, RequestException
 from requests.adapters import HTTPAdapter
@@ -14,8 +17,6 @@ from flasgger import Swagger
 
 load_dotenv()
 
-app = Flask(__name__)
-
 # Configure Swagger UI
 swagger_config = {
     "headers": [],
@@ -45,8 +46,6 @@ swagger_template = {
     ],
 }
 
-swagger = Swagger(app, config=swagger_config, template=swagger_template)
-
 # Set up logging
 log_directory = os.environ.get("LOG_DIRECTORY", "/app/log")
 log_filename = os.path.join(log_directory, "jellyfin_telegram-notifier.log")
@@ -107,36 +106,55 @@ def create_session_with_retries():
 # Create session with retry logic
 http_session = create_session_with_retries()
 
+
 # Path for the JSON file to store notified items
-notified_items_file = os.environ.get("NOTIFIED_ITEMS_FILE", "/app/data/notified_items.json")
+@lru_cache(maxsize=1)
+def notified_items_file():
+    """
+    Return the path of the JSON file used to store notified items.
 
-# Ensure the data directory exists
-data_directory = os.path.dirname(notified_items_file)
-try:
-    os.makedirs(data_directory, exist_ok=True)
-except (PermissionError, OSError):
-    # In test environment, use a temporary file
-    fd, notified_items_file = tempfile.mkstemp(suffix=".json")
-    # Initialize with empty JSON object
-    os.write(fd, b"{}")
-    os.close(fd)  # Close the file descriptor, we'll use the path
+    The path is read from NOTIFIED_ITEMS_FILE on first use and cached. Call
+    notified_items_file.cache_clear() after changing the environment variable.
+
+    Returns:
+        str: Path to the notified items file, or a temporary file if the data
+        directory cannot be created
+    """
+    path = os.environ.get("NOTIFIED_ITEMS_FILE", "/app/data/notified_items.json")
+
+    # Ensure the data directory exists
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    except (PermissionError, OSError):
+        # In test environment, use a temporary file
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)  # Close the file descriptor, we'll use the path
+    return path
 
 
 # Function to load notified items from the JSON file
 def load_notified_items():
-    if os.path.exists(notified_items_file):
-        with open(notified_items_file, "r") as file:
-            return json.load(file)
-    return {}
+    try:
+        with open(notified_items_file(), "rb") as file:
+            contents = file.read()
+    except FileNotFoundError:
+        return {}
+    # A freshly created, empty file holds no history yet
+    return orjson.loads(contents) if contents else {}
 
 
 # Function to save notified items to the JSON file
 def save_notified_items(notified_items_to_save):
-    with open(notified_items_file, "w") as file:
-        json.dump(notified_items_to_save, file)
+    # Write to a temporary file and swap it into place so a crash mid-write never leaves a truncated file
+    path = notified_items_file()
+    temp_file = f"{path}.tmp"
+    with open(temp_file, "wb") as file:
+        file.write(orjson.dumps(notified_items_to_save))
+    os.replace(temp_file, path)
 
 
-notified_items = load_notified_items()
+# Insertion-ordered so the oldest notification can be evicted in O(1) once the history is full
+notified_items = OrderedDict.fromkeys(load_notified_items(), True)
 
 
 def send_telegram_photo(photo_id, caption):
@@ -186,14 +204,39 @@ def get_item_details(item_id):
     return response.json()
 
 
+@lru_cache(maxsize=1024)
+def _parse_iso_datetime(date_str):
+    """Parse an ISO 8601 date string into a naive datetime, caching repeated lookups."""
+    return datetime.fromisoformat(date_str).replace(tzinfo=None)
+
+
+def _days_since(date_str):
+    """
+    Return the number of days elapsed between an ISO 8601 date string and now.
+
+    Timezone information is ignored. Dates that cannot be parsed (such as the
+    "0000-00-00" placeholder used when Jellyfin has no date) are treated as
+    infinitely old.
+
+    Args:
+        date_str: An ISO 8601 date or datetime string
+
+    Returns:
+        float: Elapsed days, or infinity if the date is not parseable
+    """
+    try:
+        parsed = _parse_iso_datetime(date_str)
+    except ValueError:
+        return float("inf")
+    return (datetime.now() - parsed) / timedelta(days=1)
+
+
 def is_within_last_x_days(date_str, x):
-    days_ago = datetime.now() - timedelta(days=x)
-    return date_str >= days_ago.isoformat()
+    return _days_since(date_str) < x
 
 
 def is_not_within_last_x_days(date_str, x):
-    days_ago = datetime.now() - timedelta(days=x)
-    return date_str < days_ago.isoformat()
+    return _days_since(date_str) >= x
 
 
 def get_youtube_trailer_url(query):
@@ -275,21 +318,16 @@ def item_already_notified(item_type, item_name, release_year):
 def mark_item_as_notified(item_type, item_name, release_year, max_entries=100):
     key = f"{item_type}:{item_name}:{release_year}"
     notified_items[key] = True
+    notified_items.move_to_end(key)
 
-    # Check if the number of entries in notified_items exceeds the limit
-    if len(notified_items) > max_entries:
-        # Get a list of keys (notification identifiers) sorted by their insertion order (oldest first)
-        keys_sorted_by_insertion_order = sorted(notified_items, key=notified_items.get)
-
-        # Remove the oldest entry from the dictionary
-        oldest_key = keys_sorted_by_insertion_order[0]
-        del notified_items[oldest_key]
+    # Remove the oldest entries (front of the OrderedDict) while the limit is exceeded
+    while len(notified_items) > max_entries:
+        oldest_key, _ = notified_items.popitem(last=False)
         logging.info(f"Key '{oldest_key}' has been deleted from notified_items")
     # Save the updated notified items to the JSON file
     save_notified_items(notified_items)
 
 
-@app.route("/webhook", methods=["POST"])
 def announce_new_releases_from_jellyfin():
     """
     Jellyfin Webhook Endpoint
@@ -695,5 +733,31 @@ def announce_new_releases_from_jellyfin():
         return f"Error: {str(e)}"
 
 
+def create_app(test_config=None):
+    """
+    Create and configure the Flask application.
+
+    Registers the webhook endpoint and the Swagger UI. Module-level configuration
+    (environment constants, HTTP session, logging) is shared by every app instance.
+
+    Args:
+        test_config: Optional mapping of Flask config values to apply, e.g. {"TESTING": True}
+
+    Returns:
+        Flask: The configured application
+    """
+    flask_app = Flask(__name__)
+    if test_config:
+        flask_app.config.update(test_config)
+
+    flask_app.add_url_rule("/webhook", view_func=announce_new_releases_from_jellyfin, methods=["POST"])
+    Swagger(flask_app, config=swagger_config, template=swagger_template)
+
+    return flask_app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
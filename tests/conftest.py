@@ -1,82 +1,39 @@
 """Test configuration and fixtures."""
 
 import os
+import re
 import json
+import orjson
 import pytest
-import tempfile
-from unittest.mock import Mock, patch
 from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock
+from requests.exceptions import HTTPError
 
-# Set environment variables before importing app module
-os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test_bot_token")
-os.environ.setdefault("TELEGRAM_CHAT_ID", "test_chat_id")
-os.environ.setdefault("JELLYFIN_BASE_URL", "http://test-jellyfin.com")
-os.environ.setdefault("JELLYFIN_EXTERNAL_URL", "http://external-jellyfin.com")
-os.environ.setdefault("JELLYFIN_API_KEY", "test_api_key")
-os.environ.setdefault("YOUTUBE_API_KEY", "test_youtube_key")
-os.environ.setdefault("EPISODE_PREMIERED_WITHIN_X_DAYS", "7")
-os.environ.setdefault("SEASON_ADDED_WITHIN_X_DAYS", "3")
 
+class FakeResponse:
+    """Lightweight stand-in for requests.Response in unit tests."""
 
-@pytest.fixture
-def test_env_vars():
-    """Set up test environment variables."""
-    env_vars = {
-        "TELEGRAM_BOT_TOKEN": "test_bot_token",
-        "TELEGRAM_CHAT_ID": "test_chat_id",
-        "JELLYFIN_BASE_URL": "http://test-jellyfin.com",
-        "JELLYFIN_EXTERNAL_URL": "http://external-jellyfin.com",
-        "JELLYFIN_API_KEY": "test_api_key",
-        "YOUTUBE_API_KEY": "test_youtube_key",
-        "EPISODE_PREMIERED_WITHIN_X_DAYS": "7",
-        "SEASON_ADDED_WITHIN_X_DAYS": "3",
-    }
-
-    with patch.dict(os.environ, env_vars, clear=False):
-        yield env_vars
-
-
-@pytest.fixture
-def temp_data_file():
-    """Create a temporary file for notified items."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        temp_path = f.name
-        json.dump({}, f)
-
-    yield temp_path
-
-    # Cleanup
-    if os.path.exists(temp_path):
-        os.remove(temp_path)
+    __slots__ = ("_json", "status_code", "content")
 
+    def __init__(self, json_data=None, status_code=200, content=b""):
+        self._json = json_data
+        self.status_code = status_code
+        self.content = content
 
-@pytest.fixture
-def temp_log_dir():
-    """Create a temporary directory for logs."""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-
-    # Cleanup is handled by pytest's tmpdir
-    import shutil
-
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
+    def json(self):
+        return self._json
 
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} Error", response=self)
 
-@pytest.fixture
-def mock_notified_items():
-    """Sample notified items data."""
-    return {
-        "Movie:Test Movie:2023": True,
-        "Season:Season 1:2023": True,
-        "Episode:Test Episode:2023": True,
-    }
 
+# Webhook payloads are built once at import; fixtures hand out copies because some tests mutate them
+_TODAY = datetime.now().isoformat()
 
-@pytest.fixture
-def sample_movie_payload():
-    """Sample movie webhook payload from Jellyfin."""
-    return {
+_MOVIE_PAYLOAD = MappingProxyType(
+    {
         "ItemType": "Movie",
         "Name": "Test Movie",
         "Year": 2023,
@@ -84,12 +41,10 @@ def sample_movie_payload():
         "Overview": "A great test movie",
         "RunTime": "02:00:00",
     }
+)
 
-
-@pytest.fixture
-def sample_season_payload():
-    """Sample season webhook payload from Jellyfin."""
-    return {
+_SEASON_PAYLOAD = MappingProxyType(
+    {
         "ItemType": "Season",
         "Name": "Season 1",
         "Year": 2023,
@@ -97,13 +52,10 @@ def sample_season_payload():
         "SeriesName": "Test Series",
         "Overview": "First season",
     }
+)
 
-
-@pytest.fixture
-def sample_episode_payload():
-    """Sample episode webhook payload from Jellyfin."""
-    today = datetime.now().isoformat()
-    return {
+_EPISODE_PAYLOAD = MappingProxyType(
+    {
         "ItemType": "Episode",
         "Name": "Test Episode",
         "Year": 2023,
@@ -112,14 +64,12 @@ def sample_episode_payload():
         "EpisodeNumber00": "01",
         "SeasonNumber00": "01",
         "Overview": "A test episode",
-        "PremiereDate": today,
+        "PremiereDate": _TODAY,
     }
+)
 
-
-@pytest.fixture
-def sample_leaving_soon_movie_payload():
-    """Sample movie webhook payload for Leaving Soon library."""
-    return {
+_LEAVING_SOON_MOVIE_PAYLOAD = MappingProxyType(
+    {
         "ItemType": "Movie",
         "Name": "Leaving Movie",
         "Year": 2022,
@@ -127,12 +77,10 @@ def sample_leaving_soon_movie_payload():
         "Overview": "This movie is leaving soon",
         "RunTime": "01:45:00",
     }
+)
 
-
-@pytest.fixture
-def sample_leaving_soon_season_payload():
-    """Sample season webhook payload for Leaving Soon library."""
-    return {
+_LEAVING_SOON_SEASON_PAYLOAD = MappingProxyType(
+    {
         "ItemType": "Season",
         "Name": "Season 2",
         "Year": 2022,
@@ -140,13 +88,10 @@ def sample_leaving_soon_season_payload():
         "SeriesName": "Leaving Series",
         "Overview": "Second season leaving soon",
     }
+)
 
-
-@pytest.fixture
-def sample_leaving_soon_episode_payload():
-    """Sample episode webhook payload for Leaving Soon library."""
-    today = datetime.now().isoformat()
-    return {
+_LEAVING_SOON_EPISODE_PAYLOAD = MappingProxyType(
+    {
         "ItemType": "Episode",
         "Name": "Final Episode",
         "Year": 2022,
@@ -155,11 +100,94 @@ def sample_leaving_soon_episode_payload():
         "EpisodeNumber00": "05",
         "SeasonNumber00": "02",
         "Overview": "This episode is leaving soon",
-        "PremiereDate": today,
+        "PremiereDate": _TODAY,
     }
+)
+
+
+@pytest.fixture
+def temp_data_file(tmp_path, monkeypatch):
+    """Point the app at a temporary notified items file, which is not created up front."""
+    import app as app_module
+
+    path = tmp_path / "notified.json"
+    monkeypatch.setenv("NOTIFIED_ITEMS_FILE", str(path))
+    app_module.notified_items_file.cache_clear()
+    yield str(path)
+    app_module.notified_items_file.cache_clear()
 
 
 @pytest.fixture
+def temp_log_dir(tmp_path):
+    """Create a temporary directory for logs."""
+    return str(tmp_path)
+
+
+@pytest.fixture
+def mock_notified_items():
+    """Sample notified items data."""
+    return {
+        "Movie:Test Movie:2023": True,
+        "Season:Season 1:2023": True,
+        "Episode:Test Episode:2023": True,
+    }
+
+
+@pytest.fixture
+def sample_movie_payload():
+    """Sample movie webhook payload from Jellyfin."""
+    return dict(_MOVIE_PAYLOAD)
+
+
+@pytest.fixture
+def sample_season_payload():
+    """Sample season webhook payload from Jellyfin."""
+    return dict(_SEASON_PAYLOAD)
+
+
+@pytest.fixture
+def sample_episode_payload():
+    """Sample episode webhook payload from Jellyfin."""
+    return dict(_EPISODE_PAYLOAD)
+
+
+@pytest.fixture(scope="session")
+def sample_movie_payload_json():
+    """Sample movie webhook payload pre-serialized as a JSON request body."""
+    return json.dumps(dict(_MOVIE_PAYLOAD)).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_season_payload_json():
+    """Sample season webhook payload pre-serialized as a JSON request body."""
+    return json.dumps(dict(_SEASON_PAYLOAD)).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_episode_payload_json():
+    """Sample episode webhook payload pre-serialized as a JSON request body."""
+    return json.dumps(dict(_EPISODE_PAYLOAD)).encode()
+
+
+@pytest.fixture
+def sample_leaving_soon_movie_payload():
+    """Sample movie webhook payload for Leaving Soon library."""
+    return dict(_LEAVING_SOON_MOVIE_PAYLOAD)
+
+
+@pytest.fixture
+def sample_leaving_soon_season_payload():
+    """Sample season webhook payload for Leaving Soon library."""
+    return dict(_LEAVING_SOON_SEASON_PAYLOAD)
+
+
+@pytest.fixture
+def sample_leaving_soon_episode_payload():
+    """Sample episode webhook payload for Leaving Soon library."""
+    return dict(_LEAVING_SOON_EPISODE_PAYLOAD)
+
+
+@pytest.fixture(scope="session")
 def mock_jellyfin_item_details():
     """Mock Jellyfin API item details response."""
     return {
@@ -205,57 +233,96 @@ def mock_jellyfin_leaving_soon_library_details():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_youtube_response():
     """Mock YouTube API search response."""
     return {"items": [{"id": {"videoId": "test_video_id"}, "snippet": {"title": "Test Trailer"}}]}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def fake_response():
+    """Factory for lightweight HTTP response stubs."""
+    return FakeResponse
+
+
+@pytest.fixture(scope="session")
 def mock_telegram_response():
     """Mock Telegram API response."""
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"ok": True}
-    return mock_response
+    return FakeResponse({"ok": True})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_image_response():
     """Mock image download response."""
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.content = b"fake_image_data"
-    return mock_response
+    return FakeResponse(content=b"fake_image_data")
+
+
+@pytest.fixture(autouse=True)
+def mock_http_requests(requests_mock, mock_jellyfin_item_details, mock_youtube_response):
+    """Intercept outbound HTTP requests with default Jellyfin, YouTube and Telegram responses.
+
+    Tests can override any of these by registering their own response on ``requests_mock``.
+    """
+    jellyfin_base_url = os.environ["JELLYFIN_BASE_URL"]
+    jellyfin_image_url = re.compile(rf"{re.escape(jellyfin_base_url)}/Items/.+/Images/Primary")
+    requests_mock.get(f"{jellyfin_base_url}/emby/Items", json=mock_jellyfin_item_details)
+    requests_mock.get(jellyfin_image_url, content=b"fake_image_data")
+    requests_mock.get("https://www.googleapis.com/youtube/v3/search", json=mock_youtube_response)
+    requests_mock.post(re.compile(r"https://api\.telegram\.org/bot.+/sendPhoto"), json={"ok": True})
+    return requests_mock
 
 
 @pytest.fixture
-def flask_app(test_env_vars, temp_data_file, temp_log_dir, monkeypatch):
+def app_mocks(monkeypatch):
+    """Replace the app's outbound helpers with Mocks for webhook tests.
+
+    Defaults describe a new item whose notification is sent successfully; tests adjust
+    ``return_value``/``side_effect`` on the returned namespace as needed.
+    """
+    mocks = SimpleNamespace(
+        send_telegram_photo=Mock(return_value=Mock(status_code=200)),
+        get_youtube_trailer_url=Mock(return_value=None),
+        get_item_details=Mock(return_value={"Items": []}),
+        mark_item_as_notified=Mock(),
+        item_already_notified=Mock(return_value=False),
+    )
+    for name, mock in vars(mocks).items():
+        monkeypatch.setattr(f"app.{name}", mock)
+    return mocks
+
+
+@pytest.fixture(scope="session")
+def flask_app(tmp_path_factory):
     """Create a Flask app instance for testing."""
-    # Patch file paths before importing app
-    monkeypatch.setattr("app.notified_items_file", temp_data_file)
-    monkeypatch.setattr("app.log_directory", temp_log_dir)
-
-    # Import after patching environment
     import app as app_module
 
-    # Reload the module to pick up the test environment
-    import importlib
+    # Keep the notification history written by webhook tests out of the real data directory
+    notified_items_path = tmp_path_factory.mktemp("data") / "notified.json"
 
-    importlib.reload(app_module)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("NOTIFIED_ITEMS_FILE", str(notified_items_path))
+        app_module.notified_items_file.cache_clear()
+        yield app_module.create_app({"TESTING": True})
+    app_module.notified_items_file.cache_clear()
 
-    app_module.app.config["TESTING"] = True
 
-    # Reset notified_items before each test
-    app_module.notified_items.clear()
+@pytest.fixture(scope="session")
+def client(flask_app):
+    """Create a test client for the Flask app."""
+    return flask_app.test_client()
 
-    yield app_module.app
 
-    # Reset notified_items after test
-    app_module.notified_items.clear()
+@pytest.fixture(scope="session")
+def apispec(client):
+    """Fetch and parse the generated OpenAPI spec once per session."""
+    return orjson.loads(client.get("/apispec.json").data)
 
 
-@pytest.fixture
-def client(flask_app):
-    """Create a test client for the Flask app."""
-    return flask_app.test_client()
+@pytest.fixture(autouse=True)
+def reset_notified_items():
+    """Reset notified_items before and after each test."""
+    import app as app_module
+
+    app_module.notified_items.clear()
+    yield
+    app_module.notified_items.clear()
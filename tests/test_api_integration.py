@@ -5,107 +5,78 @@ from unittest.mock import patch, Mock
 from requests.exceptions import HTTPError, RequestException, Timeout
 import app
 
+JELLYFIN_ITEMS_URL = f"{app.JELLYFIN_BASE_URL}/emby/Items"
+YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+
 
 @pytest.mark.unit
 class TestJellyfinAPI:
     """Test Jellyfin API integration functions."""
 
-    @patch("app.http_session.get")
-    def test_get_item_details_success(self, mock_get, mock_jellyfin_item_details):
+    def test_get_item_details_success(self, requests_mock, mock_jellyfin_item_details):
         """Test successful item details retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_jellyfin_item_details
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-
         result = app.get_item_details("item123")
 
         assert result == mock_jellyfin_item_details
-        mock_get.assert_called_once()
+        assert requests_mock.call_count == 1
 
         # Verify URL construction
-        call_args = mock_get.call_args
-        assert "item123" in call_args[0][0]
+        assert "item123" in requests_mock.last_request.url
 
-    @patch("app.http_session.get")
-    def test_get_item_details_http_error(self, mock_get):
+    def test_get_item_details_http_error(self, requests_mock):
         """Test get_item_details handles HTTP errors."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = HTTPError("API Error")
-        mock_get.return_value = mock_response
+        requests_mock.get(JELLYFIN_ITEMS_URL, status_code=404)
 
         with pytest.raises(HTTPError):
             app.get_item_details("item123")
 
-    @patch("app.http_session.get")
-    def test_get_item_details_api_key_in_params(self, mock_get):
+    def test_get_item_details_api_key_in_params(self, requests_mock):
         """Test that API key is included in request parameters."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"Items": []}
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        requests_mock.get(JELLYFIN_ITEMS_URL, json={"Items": []})
 
         app.get_item_details("item123")
 
-        # Check that api_key was passed in params
-        call_args = mock_get.call_args
-        assert "params" in call_args[1]
-        assert "api_key" in call_args[1]["params"]
+        # Check that api_key was passed in the query string
+        assert "api_key" in requests_mock.last_request.qs
 
 
 @pytest.mark.unit
 class TestYouTubeAPI:
     """Test YouTube API integration functions."""
 
-    @patch("app.http_session.get")
-    def test_get_youtube_trailer_url_success(self, mock_get, mock_youtube_response):
+    def test_get_youtube_trailer_url_success(self, requests_mock):
         """Test successful YouTube trailer URL retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_youtube_response
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-
         result = app.get_youtube_trailer_url("Test Movie Trailer 2023")
 
         assert result == "https://www.youtube.com/watch?v=test_video_id"
-        mock_get.assert_called_once()
+        assert requests_mock.call_count == 1
 
-    @patch("app.http_session.get")
-    def test_get_youtube_trailer_url_no_results(self, mock_get):
+    def test_get_youtube_trailer_url_no_results(self, requests_mock):
         """Test YouTube API with no results."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"items": []}
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        requests_mock.get(YOUTUBE_SEARCH_URL, json={"items": []})
 
         result = app.get_youtube_trailer_url("Nonexistent Movie")
 
         assert result == "Video not found!"
 
-    @patch("app.http_session.get")
-    def test_get_youtube_trailer_url_http_error(self, mock_get):
+    def test_get_youtube_trailer_url_http_error(self, requests_mock):
         """Test YouTube API handles HTTP errors."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = HTTPError("API Error")
-        mock_get.return_value = mock_response
+        requests_mock.get(YOUTUBE_SEARCH_URL, status_code=403)
 
         with pytest.raises(HTTPError):
             app.get_youtube_trailer_url("Test Movie")
 
-    @patch("app.YOUTUBE_API_KEY", None)
-    def test_get_youtube_trailer_url_no_api_key(self):
+    def test_get_youtube_trailer_url_no_api_key(self, monkeypatch):
         """Test YouTube API returns None when no API key is set."""
+        monkeypatch.setattr(app, "YOUTUBE_API_KEY", None)
+
         result = app.get_youtube_trailer_url("Test Movie")
 
         assert result is None
 
-    @patch("app.http_session.get")
-    def test_get_youtube_trailer_url_malformed_response(self, mock_get):
+    def test_get_youtube_trailer_url_malformed_response(self, requests_mock):
         """Test YouTube API handles malformed response."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"items": [{"id": {}}]}  # Missing videoId
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        requests_mock.get(YOUTUBE_SEARCH_URL, json={"items": [{"id": {}}]})  # Missing videoId
 
         result = app.get_youtube_trailer_url("Test Movie")
 
@@ -116,15 +87,13 @@ class TestYouTubeAPI:
 class TestTelegramAPI:
     """Test Telegram API integration functions."""
 
-    @patch("app.http_session.post")
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_success(self, mock_get, mock_post, mock_image_response, mock_telegram_response):
+    def test_send_telegram_photo_success(self, mock_image_response, mock_telegram_response):
         """Test successful Telegram photo sending."""
-        mock_get.return_value = mock_image_response
-        mock_image_response.raise_for_status = Mock()
-        mock_post.return_value = mock_telegram_response
+        mock_get = Mock(return_value=mock_image_response)
+        mock_post = Mock(return_value=mock_telegram_response)
 
-        result = app.send_telegram_photo("photo123", "Test caption")
+        with patch.multiple(app.http_session, get=mock_get, post=mock_post):
+            result = app.send_telegram_photo("photo123", "Test caption")
 
         assert result.status_code == 200
         mock_get.assert_called_once()
@@ -136,31 +105,27 @@ class TestTelegramAPI:
         assert call_args[1]["data"]["caption"] == "Test caption"
         assert call_args[1]["data"]["parse_mode"] == "Markdown"
 
-    @patch("app.http_session.post")
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_image_download(self, mock_get, mock_post, mock_image_response, mock_telegram_response):
+    def test_send_telegram_photo_image_download(self, mock_image_response, mock_telegram_response):
         """Test that image is downloaded from Jellyfin."""
-        mock_get.return_value = mock_image_response
-        mock_image_response.raise_for_status = Mock()
-        mock_post.return_value = mock_telegram_response
+        mock_get = Mock(return_value=mock_image_response)
+        mock_post = Mock(return_value=mock_telegram_response)
 
-        app.send_telegram_photo("photo123", "Test caption")
+        with patch.multiple(app.http_session, get=mock_get, post=mock_post):
+            app.send_telegram_photo("photo123", "Test caption")
 
         # Verify image was downloaded from Jellyfin
         call_args = mock_get.call_args
         assert "photo123" in call_args[0][0]
         assert "Images/Primary" in call_args[0][0]
 
-    @patch("app.http_session.post")
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_with_markdown(self, mock_get, mock_post, mock_image_response, mock_telegram_response):
+    def test_send_telegram_photo_with_markdown(self, mock_image_response, mock_telegram_response):
         """Test that Markdown formatting is preserved."""
-        mock_get.return_value = mock_image_response
-        mock_image_response.raise_for_status = Mock()
-        mock_post.return_value = mock_telegram_response
+        mock_get = Mock(return_value=mock_image_response)
+        mock_post = Mock(return_value=mock_telegram_response)
 
         caption_with_markdown = "*Bold* _Italic_ [Link](http://example.com)"
-        app.send_telegram_photo("photo123", caption_with_markdown)
+        with patch.multiple(app.http_session, get=mock_get, post=mock_post):
+            app.send_telegram_photo("photo123", caption_with_markdown)
 
         call_args = mock_post.call_args
         assert call_args[1]["data"]["caption"] == caption_with_markdown
@@ -171,13 +136,10 @@ class TestTelegramAPI:
 class TestHTTPRequestEnhancements:
     """Test timeout, retry, and error handling enhancements."""
 
-    @patch("app.http_session.get")
-    def test_get_item_details_includes_timeout(self, mock_get):
+    def test_get_item_details_includes_timeout(self, monkeypatch, fake_response):
         """Test that get_item_details includes timeout parameter."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"Items": []}
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        mock_get = Mock(return_value=fake_response({"Items": []}))
+        monkeypatch.setattr(app.http_session, "get", mock_get)
 
         app.get_item_details("item123")
 
@@ -186,13 +148,10 @@ class TestHTTPRequestEnhancements:
         assert "timeout" in call_args[1]
         assert call_args[1]["timeout"] == app.REQUEST_TIMEOUT
 
-    @patch("app.http_session.get")
-    def test_youtube_api_includes_timeout(self, mock_get):
+    def test_youtube_api_includes_timeout(self, monkeypatch, fake_response):
         """Test that get_youtube_trailer_url includes timeout parameter."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"items": []}
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        mock_get = Mock(return_value=fake_response({"items": []}))
+        monkeypatch.setattr(app.http_session, "get", mock_get)
 
         app.get_youtube_trailer_url("Test Movie")
 
@@ -201,17 +160,13 @@ class TestHTTPRequestEnhancements:
         assert "timeout" in call_args[1]
         assert call_args[1]["timeout"] == app.REQUEST_TIMEOUT
 
-    @patch("app.http_session.post")
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_includes_timeouts(
-        self, mock_get, mock_post, mock_image_response, mock_telegram_response
-    ):
+    def test_send_telegram_photo_includes_timeouts(self, mock_image_response, mock_telegram_response):
         """Test that send_telegram_photo includes timeout parameters."""
-        mock_get.return_value = mock_image_response
-        mock_image_response.raise_for_status = Mock()
-        mock_post.return_value = mock_telegram_response
+        mock_get = Mock(return_value=mock_image_response)
+        mock_post = Mock(return_value=mock_telegram_response)
 
-        app.send_telegram_photo("photo123", "Test caption")
+        with patch.multiple(app.http_session, get=mock_get, post=mock_post):
+            app.send_telegram_photo("photo123", "Test caption")
 
         # Verify image download timeout
         get_call_args = mock_get.call_args
@@ -223,28 +178,23 @@ class TestHTTPRequestEnhancements:
         assert "timeout" in post_call_args[1]
         assert post_call_args[1]["timeout"] == app.REQUEST_TIMEOUT
 
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_handles_image_download_failure(self, mock_get):
+    def test_send_telegram_photo_handles_image_download_failure(self, monkeypatch):
         """Test that send_telegram_photo raises exception on image download failure."""
-        mock_get.side_effect = RequestException("Connection failed")
+        monkeypatch.setattr(app.http_session, "get", Mock(side_effect=RequestException("Connection failed")))
 
         with pytest.raises(RequestException):
             app.send_telegram_photo("photo123", "Test caption")
 
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_handles_timeout(self, mock_get):
+    def test_send_telegram_photo_handles_timeout(self, monkeypatch):
         """Test that send_telegram_photo raises exception on timeout."""
-        mock_get.side_effect = Timeout("Request timed out")
+        monkeypatch.setattr(app.http_session, "get", Mock(side_effect=Timeout("Request timed out")))
 
         with pytest.raises(Timeout):
             app.send_telegram_photo("photo123", "Test caption")
 
-    @patch("app.http_session.get")
-    def test_send_telegram_photo_handles_http_error(self, mock_get):
+    def test_send_telegram_photo_handles_http_error(self, monkeypatch, fake_response):
         """Test that send_telegram_photo raises exception on HTTP error."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = HTTPError("404 Not Found")
-        mock_get.return_value = mock_response
+        monkeypatch.setattr(app.http_session, "get", Mock(return_value=fake_response(status_code=404)))
 
         with pytest.raises(HTTPError):
             app.send_telegram_photo("photo123", "Test caption")
@@ -280,25 +230,21 @@ class TestHTTPRequestEnhancements:
 class TestLibraryDetection:
     """Test library detection functions."""
 
-    @patch("app.get_item_details")
-    def test_extract_library_name_success(
-        self, mock_get_details, mock_jellyfin_item_details, mock_jellyfin_library_details
-    ):
+    def test_extract_library_name_success(self, monkeypatch, mock_jellyfin_item_details, mock_jellyfin_library_details):
         """Test successful library name extraction."""
         # When called with the item ID, return item with parent ID
         # When called with parent ID, return the library
-        mock_get_details.side_effect = [mock_jellyfin_library_details]
+        monkeypatch.setattr(app, "get_item_details", Mock(side_effect=[mock_jellyfin_library_details]))
 
         result = app.extract_library_name(mock_jellyfin_item_details)
 
         assert result == "Movies"
 
-    @patch("app.get_item_details")
     def test_extract_library_name_with_leaving_soon(
-        self, mock_get_details, mock_jellyfin_item_details, mock_jellyfin_leaving_soon_library_details
+        self, monkeypatch, mock_jellyfin_item_details, mock_jellyfin_leaving_soon_library_details
     ):
         """Test library name extraction for leaving soon library."""
-        mock_get_details.side_effect = [mock_jellyfin_leaving_soon_library_details]
+        monkeypatch.setattr(app, "get_item_details", Mock(side_effect=[mock_jellyfin_leaving_soon_library_details]))
 
         result = app.extract_library_name(mock_jellyfin_item_details)
 
@@ -333,10 +279,9 @@ class TestLibraryDetection:
 
         assert result is None
 
-    @patch("app.get_item_details")
-    def test_extract_library_name_api_error(self, mock_get_details, mock_jellyfin_item_details):
+    def test_extract_library_name_api_error(self, monkeypatch, mock_jellyfin_item_details):
         """Test library name extraction handles API errors gracefully."""
-        mock_get_details.side_effect = Exception("API Error")
+        monkeypatch.setattr(app, "get_item_details", Mock(side_effect=Exception("API Error")))
 
         result = app.extract_library_name(mock_jellyfin_item_details)
 
@@ -2,67 +2,67 @@
 
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import patch
+from freezegun import freeze_time
 import app
 
 
+@pytest.fixture(autouse=True, scope="module")
+def frozen_time():
+    """Freeze the clock for every date filtering test in this module."""
+    with freeze_time("2024-06-01T12:00:00") as frozen:
+        yield frozen
+
+
 @pytest.mark.unit
 class TestDateFiltering:
     """Test date filtering functions."""
 
-    def test_is_within_last_x_days_recent_date(self):
-        """Test is_within_last_x_days with a recent date."""
-        # Date from 3 days ago
-        recent_date = (datetime.now() - timedelta(days=3)).isoformat()
-        assert app.is_within_last_x_days(recent_date, 7) is True
-
-    def test_is_within_last_x_days_old_date(self):
-        """Test is_within_last_x_days with an old date."""
-        # Date from 10 days ago
-        old_date = (datetime.now() - timedelta(days=10)).isoformat()
-        assert app.is_within_last_x_days(old_date, 7) is False
-
-    def test_is_within_last_x_days_exact_boundary(self):
-        """Test is_within_last_x_days at exact boundary."""
-        # Date from exactly 7 days ago
-        boundary_date = (datetime.now() - timedelta(days=7)).isoformat()
-        assert app.is_within_last_x_days(boundary_date, 7) is False
-
-    def test_is_within_last_x_days_today(self):
-        """Test is_within_last_x_days with today's date."""
-        today = datetime.now().isoformat()
-        assert app.is_within_last_x_days(today, 7) is True
-
-    def test_is_not_within_last_x_days_recent_date(self):
-        """Test is_not_within_last_x_days with a recent date."""
-        # Date from 1 day ago
-        recent_date = (datetime.now() - timedelta(days=1)).isoformat()
-        assert app.is_not_within_last_x_days(recent_date, 3) is False
+    @pytest.mark.parametrize(
+        "days_ago, window, expected",
+        [
+            (3, 7, True),
+            (10, 7, False),
+            (7, 7, False),
+            (0, 7, True),
+        ],
+        ids=["recent_date", "old_date", "exact_boundary", "today"],
+    )
+    def test_is_within_last_x_days(self, days_ago, window, expected):
+        """Test is_within_last_x_days for recent, old, boundary and current dates."""
+        date_str = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        assert app.is_within_last_x_days(date_str, window) is expected
 
-    def test_is_not_within_last_x_days_old_date(self):
-        """Test is_not_within_last_x_days with an old date."""
-        # Date from 10 days ago
-        old_date = (datetime.now() - timedelta(days=10)).isoformat()
-        assert app.is_not_within_last_x_days(old_date, 3) is True
-
-    def test_is_not_within_last_x_days_exact_boundary(self):
-        """Test is_not_within_last_x_days at exact boundary."""
-        # Date from exactly 3 days ago
-        boundary_date = (datetime.now() - timedelta(days=3)).isoformat()
-        assert app.is_not_within_last_x_days(boundary_date, 3) is True
-
-    def test_is_not_within_last_x_days_today(self):
-        """Test is_not_within_last_x_days with today's date."""
-        today = datetime.now().isoformat()
-        assert app.is_not_within_last_x_days(today, 3) is False
+    @pytest.mark.parametrize(
+        "days_ago, window, expected",
+        [
+            (1, 3, False),
+            (10, 3, True),
+            (3, 3, True),
+            (0, 3, False),
+        ],
+        ids=["recent_date", "old_date", "exact_boundary", "today"],
+    )
+    def test_is_not_within_last_x_days(self, days_ago, window, expected):
+        """Test is_not_within_last_x_days for recent, old, boundary and current dates."""
+        date_str = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        assert app.is_not_within_last_x_days(date_str, window) is expected
 
+    @freeze_time("2023-01-05T12:00:00")
     def test_date_with_timezone_info(self):
         """Test date functions with timezone information."""
-        # Date with timezone
+        # Date with timezone, 4.5 days before the frozen time
         date_with_tz = "2023-01-01T00:00:00.0000000Z"
-        # Mock datetime.now to return a specific date for testing
-        with patch("app.datetime") as mock_datetime:
-            mock_datetime.now.return_value = datetime(2023, 1, 5, 12, 0, 0)
-            # 4 days difference
-            assert app.is_within_last_x_days(date_with_tz, 7) is True
-            assert app.is_not_within_last_x_days(date_with_tz, 3) is True
+        assert app.is_within_last_x_days(date_with_tz, 7) is True
+        assert app.is_not_within_last_x_days(date_with_tz, 3) is True
+
+    def test_parse_iso_datetime_caches_z_suffix_dates(self):
+        """Test that Jellyfin's "Z"-suffixed timestamps are parsed natively and cached."""
+        app._parse_iso_datetime.cache_clear()
+        date_str = "2023-01-01T00:00:00.0000000Z"
+
+        parsed = app._parse_iso_datetime(date_str)
+        assert parsed == datetime(2023, 1, 1)
+        assert parsed.tzinfo is None
+
+        app._parse_iso_datetime(date_str)
+        assert app._parse_iso_datetime.cache_info().hits == 1
@@ -1,7 +1,9 @@
 """Unit tests for notification tracking functions."""
 
+import os
 import pytest
 import json
+from collections import OrderedDict
 from unittest.mock import patch
 import app
 
@@ -17,29 +19,40 @@ class TestNotificationTracking:
         with open(temp_data_file, "w") as f:
             json.dump(test_data, f)
 
-        # Mock the file path
-        with patch("app.notified_items_file", temp_data_file):
-            result = app.load_notified_items()
-            assert result == test_data
+        result = app.load_notified_items()
+        assert result == test_data
 
-    def test_load_notified_items_nonexistent_file(self):
+    def test_load_notified_items_nonexistent_file(self, temp_data_file):
         """Test loading notified items when file doesn't exist."""
-        with patch("app.notified_items_file", "/nonexistent/path/file.json"):
-            result = app.load_notified_items()
-            assert result == {}
+        assert not os.path.exists(temp_data_file)
+
+        result = app.load_notified_items()
+        assert result == {}
+
+    def test_load_notified_items_empty_file(self, temp_data_file):
+        """Test loading notified items from an empty file."""
+        open(temp_data_file, "w").close()
+
+        result = app.load_notified_items()
+        assert result == {}
+
+    def test_notified_items_file_uses_environment(self, temp_data_file):
+        """Test that the notified items path is read from NOTIFIED_ITEMS_FILE."""
+        assert app.notified_items_file() == temp_data_file
 
     def test_save_notified_items(self, temp_data_file):
         """Test saving notified items to file."""
         test_data = {"Movie:Test Movie:2023": True, "Season:Season 1:2023": True}
 
-        with patch("app.notified_items_file", temp_data_file):
-            app.save_notified_items(test_data)
+        app.save_notified_items(test_data)
 
-            # Verify file contents
-            with open(temp_data_file, "r") as f:
-                saved_data = json.load(f)
+        # Verify file contents
+        with open(temp_data_file, "r") as f:
+            saved_data = json.load(f)
 
-            assert saved_data == test_data
+        assert saved_data == test_data
+        # The temporary file used for the atomic write is swapped into place
+        assert not os.path.exists(f"{temp_data_file}.tmp")
 
     def test_item_already_notified_true(self):
         """Test item_already_notified when item exists."""
@@ -55,41 +68,50 @@ class TestNotificationTracking:
 
     def test_mark_item_as_notified(self, temp_data_file):
         """Test marking an item as notified."""
-        with patch("app.notified_items_file", temp_data_file):
-            with patch("app.notified_items", {}):
-                app.mark_item_as_notified("Movie", "Test Movie", 2023)
+        with patch("app.notified_items", OrderedDict()):
+            app.mark_item_as_notified("Movie", "Test Movie", 2023)
 
-                # Check the item was added
-                key = "Movie:Test Movie:2023"
-                assert key in app.notified_items
-                assert app.notified_items[key] is True
+            # Check the item was added
+            key = "Movie:Test Movie:2023"
+            assert key in app.notified_items
+            assert app.notified_items[key] is True
 
     def test_mark_item_as_notified_max_entries(self, temp_data_file):
         """Test that old entries are removed when max is exceeded."""
         # Create initial data with max entries
-        initial_data = {f"Movie:Movie{i}:2023": True for i in range(100)}
+        initial_data = OrderedDict((f"Movie:Movie{i}:2023", True) for i in range(100))
 
-        with patch("app.notified_items_file", temp_data_file):
-            with patch("app.notified_items", initial_data):
-                # Add one more item
-                app.mark_item_as_notified("Movie", "New Movie", 2023)
+        with patch("app.notified_items", initial_data):
+            # Add one more item
+            app.mark_item_as_notified("Movie", "New Movie", 2023)
 
-                # Should have exactly 100 items (oldest one removed)
-                assert len(app.notified_items) == 100
-                assert "Movie:New Movie:2023" in app.notified_items
+            # Should have exactly 100 items (oldest one removed)
+            assert len(app.notified_items) == 100
+            assert "Movie:New Movie:2023" in app.notified_items
+            assert "Movie:Movie0:2023" not in app.notified_items
 
     def test_mark_item_as_notified_custom_max(self, temp_data_file):
         """Test mark_item_as_notified with custom max_entries."""
-        initial_data = {f"Movie:Movie{i}:2023": True for i in range(10)}
+        initial_data = OrderedDict((f"Movie:Movie{i}:2023", True) for i in range(10))
+
+        with patch("app.notified_items", initial_data):
+            # Add with max_entries=10
+            app.mark_item_as_notified("Movie", "New Movie", 2023, max_entries=10)
+
+            # Should have exactly 10 items
+            assert len(app.notified_items) == 10
+            assert "Movie:New Movie:2023" in app.notified_items
+
+    def test_mark_item_as_notified_refreshes_existing_entry(self, temp_data_file):
+        """Test that re-marking an item moves it to the newest position."""
+        initial_data = OrderedDict((f"Movie:Movie{i}:2023", True) for i in range(3))
 
-        with patch("app.notified_items_file", temp_data_file):
-            with patch("app.notified_items", initial_data):
-                # Add with max_entries=10
-                app.mark_item_as_notified("Movie", "New Movie", 2023, max_entries=10)
+        with patch("app.notified_items", initial_data):
+            app.mark_item_as_notified("Movie", "Movie0", 2023, max_entries=3)
+            app.mark_item_as_notified("Movie", "New Movie", 2023, max_entries=3)
 
-                # Should have exactly 10 items
-                assert len(app.notified_items) == 10
-                assert "Movie:New Movie:2023" in app.notified_items
+            # Movie0 was refreshed, so Movie1 is now the oldest and gets evicted
+            assert list(app.notified_items) == ["Movie:Movie2:2023", "Movie:Movie0:2023", "Movie:New Movie:2023"]
 
     def test_notified_items_key_format(self):
         """Test the key format for notified items."""
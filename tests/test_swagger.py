@@ -13,7 +13,8 @@ class TestSwaggerUI:
         """Test that /docs returns HTML content."""
         response = client.get("/docs")
         assert response.content_type.startswith("text/html")
-        assert b"swagger-ui" in response.data.lower() or b"swagger" in response.data.lower()
+        body = response.get_data(as_text=True).lower()
+        assert "swagger-ui" in body or "swagger" in body
 
     def test_apispec_endpoint_exists(self, client):
         """Test that /apispec.json endpoint is accessible."""
@@ -25,31 +26,22 @@ class TestSwaggerUI:
         response = client.get("/apispec.json")
         assert response.content_type == "application/json"
 
-    def test_apispec_contains_swagger_info(self, client):
+    def test_apispec_contains_swagger_info(self, apispec):
         """Test that apispec contains proper Swagger information."""
-        response = client.get("/apispec.json")
-        data = response.get_json()
-
-        assert "swagger" in data
-        assert "info" in data
-        assert data["info"]["title"] == "Jellyfin Telegram Notifier API"
-        assert "version" in data["info"]
+        assert "swagger" in apispec
+        assert "info" in apispec
+        assert apispec["info"]["title"] == "Jellyfin Telegram Notifier API"
+        assert "version" in apispec["info"]
 
-    def test_apispec_contains_webhook_endpoint(self, client):
+    def test_apispec_contains_webhook_endpoint(self, apispec):
         """Test that apispec documents the webhook endpoint."""
-        response = client.get("/apispec.json")
-        data = response.get_json()
+        assert "paths" in apispec
+        assert "/webhook" in apispec["paths"]
+        assert "post" in apispec["paths"]["/webhook"]
 
-        assert "paths" in data
-        assert "/webhook" in data["paths"]
-        assert "post" in data["paths"]["/webhook"]
-
-    def test_webhook_endpoint_has_documentation(self, client):
+    def test_webhook_endpoint_has_documentation(self, apispec):
         """Test that webhook endpoint has proper OpenAPI documentation."""
-        response = client.get("/apispec.json")
-        data = response.get_json()
-
-        webhook_spec = data["paths"]["/webhook"]["post"]
+        webhook_spec = apispec["paths"]["/webhook"]["post"]
 
         # Check basic documentation fields
         assert "summary" in webhook_spec
@@ -57,20 +49,14 @@ class TestSwaggerUI:
         assert "parameters" in webhook_spec
         assert "responses" in webhook_spec
 
-    def test_webhook_endpoint_has_tags(self, client):
+    def test_webhook_endpoint_has_tags(self, apispec):
         """Test that webhook endpoint is properly tagged."""
-        response = client.get("/apispec.json")
-        data = response.get_json()
-
-        webhook_spec = data["paths"]["/webhook"]["post"]
+        webhook_spec = apispec["paths"]["/webhook"]["post"]
         assert "tags" in webhook_spec
         assert "webhook" in webhook_spec["tags"]
 
-    def test_apispec_defines_tags(self, client):
+    def test_apispec_defines_tags(self, apispec):
         """Test that apispec defines the tags used."""
-        response = client.get("/apispec.json")
-        data = response.get_json()
-
-        assert "tags" in data
-        tag_names = [tag["name"] for tag in data["tags"]]
+        assert "tags" in apispec
+        tag_names = [tag["name"] for tag in apispec["tags"]]
         assert "webhook" in tag_names
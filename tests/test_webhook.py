@@ -1,145 +1,148 @@
 """Integration tests for webhook endpoint."""
 
+import re
 import pytest
-import json
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
 from datetime import datetime, timedelta
+from freezegun import freeze_time
+
+# Episode tests compare Jellyfin dates against the current time, so pin it
+NOW = datetime(2024, 1, 15, 12, 0, 0)
+NOW_ISO = NOW.isoformat()
+
+# Shared Telegram response doubles; tests only read their status_code
+OK_RESPONSE = Mock(status_code=200)
+NOT_FOUND_RESPONSE = Mock(status_code=404)
+
+EXPECTED_MOVIE_SUBSTRINGS = (
+    "*🍿New Movie Added🍿*",
+    "*Test Movie*",
+    "*(2023)*",
+    "A great test movie",
+    "02:00:00",
+    "Trailer",
+    "Watch Now",
+    "http://external-jellyfin.com/web/index.html#!/details?id=movie123",
+)
+
+# Cleaned title, then the year, then the Watch Now link, in message order
+CLEANED_MOVIE_MESSAGE_RE = re.compile(r"\*Test Movie\*.+?\*\(2023\)\*.+?Watch Now", re.S)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def frozen_time():
+    """Freeze the clock at NOW for every webhook test in this module."""
+    with freeze_time(NOW) as frozen:
+        yield frozen
 
 
 @pytest.mark.integration
 class TestWebhookMovie:
     """Test webhook endpoint for movie notifications."""
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_youtube_trailer_url")
-    @patch("app.mark_item_as_notified")
-    def test_movie_webhook_success(self, mock_mark, mock_youtube, mock_telegram, client, sample_movie_payload):
+    def test_movie_webhook_success(self, app_mocks, client, sample_movie_payload_json):
         """Test successful movie notification."""
-        mock_youtube.return_value = "https://youtube.com/watch?v=test"
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_youtube_trailer_url.return_value = "https://youtube.com/watch?v=test"
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", data=sample_movie_payload_json, content_type="application/json")
 
         assert response.status_code == 200
-        assert b"Movie notification was sent to telegram" in response.data
-        mock_telegram.assert_called_once()
-        mock_mark.assert_called_once_with("Movie", "Test Movie", 2023)
-
-    @patch("app.send_telegram_photo")
-    @patch("app.get_youtube_trailer_url")
-    @patch("app.item_already_notified")
-    def test_movie_webhook_already_notified(
-        self, mock_already, mock_youtube, mock_telegram, client, sample_movie_payload
-    ):
+        body = response.get_data(as_text=True)
+        assert "Movie notification was sent to telegram" in body
+        app_mocks.send_telegram_photo.assert_called_once()
+        app_mocks.mark_item_as_notified.assert_called_once_with("Movie", "Test Movie", 2023)
+
+    def test_movie_webhook_already_notified(self, app_mocks, client, sample_movie_payload_json):
         """Test movie webhook when already notified."""
-        mock_already.return_value = True
+        app_mocks.item_already_notified.return_value = True
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", data=sample_movie_payload_json, content_type="application/json")
 
         assert response.status_code == 200
-        mock_telegram.assert_not_called()
+        app_mocks.send_telegram_photo.assert_not_called()
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_youtube_trailer_url")
-    def test_movie_webhook_notification_message_format(self, mock_youtube, mock_telegram, client, sample_movie_payload):
+    def test_movie_webhook_notification_message_format(self, app_mocks, client, sample_movie_payload_json):
         """Test that movie notification message is formatted correctly."""
-        mock_youtube.return_value = "https://youtube.com/watch?v=trailer"
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_youtube_trailer_url.return_value = "https://youtube.com/watch?v=trailer"
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", data=sample_movie_payload_json, content_type="application/json")
 
         assert response.status_code == 200
 
         # Check the notification message format
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
-        assert "*🍿New Movie Added🍿*" in message
-        assert "*Test Movie*" in message
-        assert "*(2023)*" in message
-        assert "A great test movie" in message
-        assert "02:00:00" in message
-        assert "Trailer" in message
-        assert "Watch Now" in message
+        missing = [substring for substring in EXPECTED_MOVIE_SUBSTRINGS if substring not in message]
+        assert not missing, missing
         # Verify external URL is used in notifications, not internal
-        assert "http://external-jellyfin.com/web/index.html#!/details?id=movie123" in message
         assert "http://test-jellyfin.com/web/index.html" not in message
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_youtube_trailer_url")
-    def test_movie_webhook_without_year_in_name(self, mock_youtube, mock_telegram, client, sample_movie_payload):
+    def test_movie_webhook_without_year_in_name(self, app_mocks, client, sample_movie_payload):
         """Test movie notification handles year in movie name."""
         sample_movie_payload["Name"] = "Test Movie (2023)"
-        mock_youtube.return_value = None
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_youtube_trailer_url.return_value = None
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_movie_payload)
 
         assert response.status_code == 200
 
         # Verify year was stripped from movie name
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
         # Should have cleaned name in the message
-        assert "*Test Movie*" in message
-        assert "*(2023)*" in message
-        assert "Watch Now" in message
+        assert CLEANED_MOVIE_MESSAGE_RE.search(message), message
 
 
 @pytest.mark.integration
 class TestWebhookSeason:
     """Test webhook endpoint for season notifications."""
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.mark_item_as_notified")
-    def test_season_webhook_success(
-        self, mock_mark, mock_get_details, mock_telegram, client, sample_season_payload, mock_jellyfin_item_details
-    ):
+    def test_season_webhook_success(self, app_mocks, client, sample_season_payload_json, mock_jellyfin_item_details):
         """Test successful season notification."""
-        mock_get_details.return_value = mock_jellyfin_item_details
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_item_details.return_value = mock_jellyfin_item_details
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_season_payload), content_type="application/json")
+        response = client.post("/webhook", data=sample_season_payload_json, content_type="application/json")
 
         assert response.status_code == 200
-        assert b"Season notification was sent to telegram" in response.data
-        mock_telegram.assert_called_once()
-        mock_mark.assert_called_once_with("Season", "Season 1", 2023)
+        body = response.get_data(as_text=True)
+        assert "Season notification was sent to telegram" in body
+        app_mocks.send_telegram_photo.assert_called_once()
+        app_mocks.mark_item_as_notified.assert_called_once_with("Season", "Season 1", 2023)
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
     def test_season_webhook_image_fallback(
-        self, mock_get_details, mock_telegram, client, sample_season_payload, mock_jellyfin_item_details
+        self, app_mocks, client, sample_season_payload_json, mock_jellyfin_item_details
     ):
         """Test season notification falls back to series image."""
-        mock_get_details.return_value = mock_jellyfin_item_details
+        app_mocks.get_item_details.return_value = mock_jellyfin_item_details
 
         # First call fails (season image), second succeeds (series image)
-        mock_telegram.side_effect = [Mock(status_code=404), Mock(status_code=200)]
+        app_mocks.send_telegram_photo.side_effect = [NOT_FOUND_RESPONSE, OK_RESPONSE]
 
-        response = client.post("/webhook", data=json.dumps(sample_season_payload), content_type="application/json")
+        response = client.post("/webhook", data=sample_season_payload_json, content_type="application/json")
 
         assert response.status_code == 200
-        assert mock_telegram.call_count == 2
+        assert app_mocks.send_telegram_photo.call_count == 2
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
     def test_season_webhook_overview_fallback(
-        self, mock_get_details, mock_telegram, client, sample_season_payload, mock_jellyfin_item_details
+        self, app_mocks, client, sample_season_payload, mock_jellyfin_item_details
     ):
         """Test season uses series overview if season overview is empty."""
         sample_season_payload["Overview"] = ""
-        mock_get_details.return_value = mock_jellyfin_item_details
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_item_details.return_value = mock_jellyfin_item_details
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_season_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_season_payload)
 
         assert response.status_code == 200
 
         # Verify series overview was used
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
         assert "Test overview" in message
         assert "Watch Now" in message
@@ -151,89 +154,35 @@ class TestWebhookSeason:
 class TestWebhookEpisode:
     """Test webhook endpoint for episode notifications."""
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.mark_item_as_notified")
-    def test_episode_webhook_success(self, mock_mark, mock_get_details, mock_telegram, client, sample_episode_payload):
-        """Test successful episode notification."""
-        # Set up mock responses for episode, season, and series details
-        episode_details = {
-            "Items": [
-                {
-                    "SeasonId": "season123",
-                    "PremiereDate": datetime.now().isoformat(),
-                }
-            ]
-        }
-        season_details = {
-            "Items": [
-                {
-                    "SeriesId": "series123",
-                    "DateCreated": (datetime.now() - timedelta(days=10)).isoformat(),
-                }
-            ]
-        }
-
-        mock_get_details.side_effect = [episode_details, season_details]
-        mock_telegram.return_value = Mock(status_code=200)
-
-        response = client.post("/webhook", data=json.dumps(sample_episode_payload), content_type="application/json")
-
-        assert response.status_code == 200
-        assert b"Notification sent to Telegram!" in response.data
-        mock_mark.assert_called_once()
-
-        # Verify Watch Now link is in the message
-        call_args = mock_telegram.call_args
-        message = call_args[0][1]
-        assert "Watch Now" in message
-        # Verify external URL is used
-        assert "http://external-jellyfin.com/web/index.html#!/details?id=episode123" in message
-
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    def test_episode_webhook_season_recently_added(
-        self, mock_get_details, mock_telegram, client, sample_episode_payload
+    @pytest.mark.parametrize(
+        "premiere_days_ago, season_days_ago, telegram_responses, expected_in_response, expected_call_count",
+        [
+            (0, 10, [OK_RESPONSE], "Notification sent to Telegram!", 1),
+            (0, 1, [], "was added within the last", 0),
+            # The response message says "was added more than" instead of "was premiered more than"
+            (30, 60, [], "was added more than", 0),
+            # First call fails (season image), second succeeds (series image)
+            (0, 10, [NOT_FOUND_RESPONSE, OK_RESPONSE], "Notification sent to Telegram!", 2),
+        ],
+        ids=["success", "season_recently_added", "old_premiere_date", "image_fallback"],
+    )
+    def test_episode_webhook(
+        self,
+        app_mocks,
+        client,
+        sample_episode_payload_json,
+        premiere_days_ago,
+        season_days_ago,
+        telegram_responses,
+        expected_in_response,
+        expected_call_count,
     ):
-        """Test episode notification skipped if season was recently added."""
-        episode_details = {
-            "Items": [
-                {
-                    "SeasonId": "season123",
-                    "PremiereDate": datetime.now().isoformat(),
-                }
-            ]
-        }
-        season_details = {
-            "Items": [
-                {
-                    "SeriesId": "series123",
-                    "DateCreated": (datetime.now() - timedelta(days=1)).isoformat(),  # Recently added
-                }
-            ]
-        }
-
-        mock_get_details.side_effect = [episode_details, season_details]
-
-        response = client.post("/webhook", data=json.dumps(sample_episode_payload), content_type="application/json")
-
-        assert response.status_code == 200
-        assert b"was added within the last" in response.data
-        mock_telegram.assert_not_called()
-
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    def test_episode_webhook_old_premiere_date(self, mock_get_details, mock_telegram, client, sample_episode_payload):
-        """Test episode notification skipped if premiere date is too old."""
-        # Old premiere date
-        old_date = (datetime.now() - timedelta(days=30)).isoformat()
-        sample_episode_payload["PremiereDate"] = old_date
-
+        """Test episode notification is sent or skipped based on premiere and season dates."""
         episode_details = {
             "Items": [
                 {
                     "SeasonId": "season123",
-                    "PremiereDate": old_date,
+                    "PremiereDate": (NOW - timedelta(days=premiere_days_ago)).isoformat(),
                 }
             ]
         }
@@ -241,66 +190,39 @@ class TestWebhookEpisode:
             "Items": [
                 {
                     "SeriesId": "series123",
-                    "DateCreated": (datetime.now() - timedelta(days=60)).isoformat(),
+                    "DateCreated": (NOW - timedelta(days=season_days_ago)).isoformat(),
                 }
             ]
         }
 
-        mock_get_details.side_effect = [episode_details, season_details]
+        app_mocks.get_item_details.side_effect = [episode_details, season_details]
+        app_mocks.send_telegram_photo.side_effect = telegram_responses
 
-        response = client.post("/webhook", data=json.dumps(sample_episode_payload), content_type="application/json")
+        response = client.post("/webhook", data=sample_episode_payload_json, content_type="application/json")
 
         assert response.status_code == 200
-        # The response message says "was added more than" instead of "was premiered more than"
-        assert b"was added more than" in response.data
-        mock_telegram.assert_not_called()
-
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    def test_episode_webhook_image_fallback(self, mock_get_details, mock_telegram, client, sample_episode_payload):
-        """Test episode notification falls back to series image."""
-        episode_details = {
-            "Items": [
-                {
-                    "SeasonId": "season123",
-                    "PremiereDate": datetime.now().isoformat(),
-                }
-            ]
-        }
-        season_details = {
-            "Items": [
-                {
-                    "SeriesId": "series123",
-                    "DateCreated": (datetime.now() - timedelta(days=10)).isoformat(),
-                }
-            ]
-        }
-
-        mock_get_details.side_effect = [episode_details, season_details]
+        body = response.get_data(as_text=True)
+        assert expected_in_response in body
+        assert app_mocks.send_telegram_photo.call_count == expected_call_count
 
-        # First call fails (season image), second succeeds (series image)
-        mock_telegram.side_effect = [Mock(status_code=404), Mock(status_code=200)]
-
-        response = client.post("/webhook", data=json.dumps(sample_episode_payload), content_type="application/json")
+        if expected_call_count:
+            app_mocks.mark_item_as_notified.assert_called_once()
 
-        assert response.status_code == 200
-        assert mock_telegram.call_count == 2
+            # Verify Watch Now link with the external URL is in the message
+            message = app_mocks.send_telegram_photo.call_args[0][1]
+            assert "Watch Now" in message
+            assert "http://external-jellyfin.com/web/index.html#!/details?id=episode123" in message
+        else:
+            app_mocks.mark_item_as_notified.assert_not_called()
 
 
 @pytest.mark.integration
 class TestWebhookLeavingSoon:
     """Test webhook endpoint with leaving soon library detection."""
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.get_youtube_trailer_url")
-    @patch("app.mark_item_as_notified")
     def test_movie_webhook_leaving_soon(
         self,
-        mock_mark,
-        mock_youtube,
-        mock_get_details,
-        mock_telegram,
+        app_mocks,
         client,
         sample_movie_payload,
         mock_jellyfin_item_details,
@@ -317,31 +239,27 @@ class TestWebhookLeavingSoon:
                 }
             ]
         }
-        mock_get_details.side_effect = [movie_with_parent, mock_jellyfin_leaving_soon_library_details]
-        mock_youtube.return_value = "https://youtube.com/watch?v=test"
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_item_details.side_effect = [movie_with_parent, mock_jellyfin_leaving_soon_library_details]
+        app_mocks.get_youtube_trailer_url.return_value = "https://youtube.com/watch?v=test"
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_movie_payload)
 
         assert response.status_code == 200
-        assert b"Movie notification was sent to telegram" in response.data
+        body = response.get_data(as_text=True)
+        assert "Movie notification was sent to telegram" in body
 
         # Verify the message includes leaving soon content
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
         assert "⚠️ *LEAVING SOON* ⚠️" in message
         assert "*Library*: Leaving Soon" in message
         assert "⚠️ This movie will be removed soon!" in message
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.mark_item_as_notified")
     def test_season_webhook_leaving_soon(
         self,
-        mock_mark,
-        mock_get_details,
-        mock_telegram,
+        app_mocks,
         client,
         sample_season_payload,
         mock_jellyfin_item_details,
@@ -358,37 +276,29 @@ class TestWebhookLeavingSoon:
                 }
             ]
         }
-        mock_get_details.side_effect = [
+        app_mocks.get_item_details.side_effect = [
             item_with_parent,
             {"Items": [{"Overview": "Series info"}]},
             mock_jellyfin_leaving_soon_library_details,
         ]
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_season_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_season_payload)
 
         assert response.status_code == 200
-        assert b"Season notification was sent to telegram" in response.data
+        body = response.get_data(as_text=True)
+        assert "Season notification was sent to telegram" in body
 
         # Verify the message includes leaving soon content
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
         assert "⚠️ *LEAVING SOON* ⚠️" in message
         assert "*Library*: Leaving Soon" in message
         assert "⚠️ This show will be removed soon!" in message
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.mark_item_as_notified")
     def test_episode_webhook_leaving_soon(
-        self,
-        mock_mark,
-        mock_get_details,
-        mock_telegram,
-        client,
-        sample_episode_payload,
-        mock_jellyfin_leaving_soon_library_details,
+        self, app_mocks, client, sample_episode_payload, mock_jellyfin_leaving_soon_library_details
     ):
         """Test episode notification includes leaving soon warning."""
         # For episode: episode details, season details, library details
@@ -398,7 +308,7 @@ class TestWebhookLeavingSoon:
                     "Id": "episode123",
                     "SeasonId": "season123",
                     "ParentId": "leaving_library123",
-                    "PremiereDate": datetime.now().isoformat(),
+                    "PremiereDate": NOW_ISO,
                 }
             ]
         }
@@ -407,39 +317,29 @@ class TestWebhookLeavingSoon:
                 {
                     "Id": "season123",
                     "SeriesId": "series123",
-                    "DateCreated": (datetime.now() - timedelta(days=10)).isoformat(),
+                    "DateCreated": (NOW - timedelta(days=10)).isoformat(),
                 }
             ]
         }
-        mock_get_details.side_effect = [episode_item, season_item, mock_jellyfin_leaving_soon_library_details]
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_item_details.side_effect = [episode_item, season_item, mock_jellyfin_leaving_soon_library_details]
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_episode_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_episode_payload)
 
         assert response.status_code == 200
-        assert b"Notification sent to Telegram!" in response.data
+        body = response.get_data(as_text=True)
+        assert "Notification sent to Telegram!" in body
 
         # Verify the message includes leaving soon content
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
         assert "⚠️ *LEAVING SOON* ⚠️" in message
         assert "*Library*: Leaving Soon" in message
         assert "⚠️ This show will be removed soon!" in message
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.get_youtube_trailer_url")
-    @patch("app.mark_item_as_notified")
     def test_movie_webhook_library_name_displayed(
-        self,
-        mock_mark,
-        mock_youtube,
-        mock_get_details,
-        mock_telegram,
-        client,
-        sample_movie_payload,
-        mock_jellyfin_library_details,
+        self, app_mocks, client, sample_movie_payload, mock_jellyfin_library_details
     ):
         """Test movie notification displays library name."""
         # First call: get item details with parent, second call: get library details
@@ -452,41 +352,36 @@ class TestWebhookLeavingSoon:
                 }
             ]
         }
-        mock_get_details.side_effect = [movie_with_parent, mock_jellyfin_library_details]
-        mock_youtube.return_value = "https://youtube.com/watch?v=test"
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_item_details.side_effect = [movie_with_parent, mock_jellyfin_library_details]
+        app_mocks.get_youtube_trailer_url.return_value = "https://youtube.com/watch?v=test"
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_movie_payload)
 
         assert response.status_code == 200
 
         # Verify library name is in the message but leaving soon is not
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
         assert "*Library*: Movies" in message
         assert "⚠️ *LEAVING SOON* ⚠️" not in message
         assert "will be removed soon" not in message
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_item_details")
-    @patch("app.get_youtube_trailer_url")
-    @patch("app.mark_item_as_notified")
-    def test_movie_webhook_graceful_failure_on_library_fetch(
-        self, mock_mark, mock_youtube, mock_get_details, mock_telegram, client, sample_movie_payload
-    ):
+    def test_movie_webhook_graceful_failure_on_library_fetch(self, app_mocks, client, sample_movie_payload):
         """Test movie notification works even if library info fetch fails."""
-        mock_get_details.side_effect = Exception("API Error")
-        mock_youtube.return_value = "https://youtube.com/watch?v=test"
-        mock_telegram.return_value = Mock(status_code=200)
+        app_mocks.get_item_details.side_effect = Exception("API Error")
+        app_mocks.get_youtube_trailer_url.return_value = "https://youtube.com/watch?v=test"
+        app_mocks.send_telegram_photo.return_value = OK_RESPONSE
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_movie_payload)
 
         assert response.status_code == 200
-        assert b"Movie notification was sent to telegram" in response.data
+        body = response.get_data(as_text=True)
+        assert "Movie notification was sent to telegram" in body
 
         # Verify the message doesn't have library info but still sent
-        call_args = mock_telegram.call_args
+        call_args = app_mocks.send_telegram_photo.call_args
         message = call_args[0][1]
 
         assert "Library" not in message
@@ -505,28 +400,29 @@ class TestWebhookErrorHandling:
             "Year": 2023,
         }
 
-        response = client.post("/webhook", data=json.dumps(payload), content_type="application/json")
+        response = client.post("/webhook", json=payload)
 
         assert response.status_code == 200
-        assert b"Item type not supported" in response.data
+        body = response.get_data(as_text=True)
+        assert "Item type not supported" in body
 
     def test_webhook_invalid_json(self, client):
         """Test webhook with invalid JSON."""
         response = client.post("/webhook", data="invalid json", content_type="application/json")
 
         assert response.status_code == 200
-        assert b"Error:" in response.data
+        body = response.get_data(as_text=True)
+        assert "Error:" in body
 
-    @patch("app.send_telegram_photo")
-    @patch("app.get_youtube_trailer_url")
-    def test_webhook_http_error(self, mock_youtube, mock_telegram, client, sample_movie_payload):
+    def test_webhook_http_error(self, app_mocks, client, sample_movie_payload):
         """Test webhook handles HTTP errors gracefully."""
         from requests.exceptions import HTTPError
 
-        mock_youtube.side_effect = HTTPError("API Error")
+        app_mocks.get_youtube_trailer_url.side_effect = HTTPError("API Error")
 
-        response = client.post("/webhook", data=json.dumps(sample_movie_payload), content_type="application/json")
+        response = client.post("/webhook", json=sample_movie_payload)
 
         assert response.status_code == 200
         # The actual response is the error message itself
-        assert b"API Error" in response.data
+        body = response.get_data(as_text=True)
+        assert "API Error" in body